@@ -52,6 +52,10 @@ FinetuneCalculator.COMMON_GPUS = {
   "jetson-orin-nano": 8
 };
 
+// GPU VRAM sizes by name as a Map, built once at load time; unlike indexing COMMON_GPUS
+// this only matches the listed names (never inherited properties such as "constructor")
+FinetuneCalculator.GPU_VRAM_BY_NAME = new Map(Object.entries(FinetuneCalculator.COMMON_GPUS));
+
 // Fine-tuning method configurations
 FinetuneCalculator.FINETUNING_METHODS = {
   "full": {
@@ -77,28 +81,98 @@ FinetuneCalculator.FINETUNING_METHODS = {
   }
 };
 
-// Function to get closest architecture based on parameter count
-FinetuneCalculator.getClosestArchitecture = function(paramsBillions) {
-  const sortedArchs = Object.keys(FinetuneCalculator.DEFAULT_ARCHITECTURES)
-    .sort((a, b) => parseFloat(a.replace('B', '')) - parseFloat(b.replace('B', '')));
+// Flattened per-method constants, resolved once from FINETUNING_METHODS
+FinetuneCalculator.METHOD_CONFIGS = {};
+
+// Function to (re)build METHOD_CONFIGS from FINETUNING_METHODS
+FinetuneCalculator.buildMethodConfigs = function() {
+  const configs = {};
+  
+  for (const [method, config] of Object.entries(FinetuneCalculator.FINETUNING_METHODS)) {
+    const bytesPerParam = FinetuneCalculator.PRECISION_BYTES[config.model_weight_precision];
+    configs[method] = Object.freeze({
+      description: config.description,
+      weight_precision: config.model_weight_precision,
+      weight_bytes: bytesPerParam,
+      optimizer_states_factor: config.optimizer_states_factor,
+      activation_factor: config.activation_factor,
+      adapter_overhead: config.adapter_overhead || 0.0,
+      // Fused GB-per-unit coefficients including the 20% training overhead:
+      // weights, optimizer states and adapters per billion parameters,
+      fixed_vram_factor: bytesPerParam *
+        (1 + config.optimizer_states_factor + (config.adapter_overhead || 0.0)) * 1.2,
+      // activations per billion parameters (before grad accumulation),
+      activation_vram_factor: bytesPerParam * config.activation_factor * 1.2,
+      // and KV cache per token per hidden unit per layer (2 for Key and Value tensors)
+      kv_vram_factor: bytesPerParam * 2e-9 * 1.2
+    });
+  }
+  
+  FinetuneCalculator.METHOD_CONFIGS = configs;
+};
+
+FinetuneCalculator.buildMethodConfigs();
+
+// Architectures sorted by parameter count and their parameter counts as a typed array (same
+// order), derived from DEFAULT_ARCHITECTURES so the lookup reads plain numbers (rebuilt by
+// clearCache; see DEFAULT_ARCHITECTURES in inference-calculator.js for the shared policy)
+FinetuneCalculator.SORTED_ARCHITECTURES = [];
+FinetuneCalculator.ARCHITECTURE_PARAMS = new Float64Array(0);
+
+// Function to (re)build SORTED_ARCHITECTURES and ARCHITECTURE_PARAMS from DEFAULT_ARCHITECTURES
+FinetuneCalculator.buildArchitectures = function() {
+  const architectures = Object.entries(FinetuneCalculator.DEFAULT_ARCHITECTURES)
+    .map(([name, arch]) => ({
+      name,
+      params_billions: parseFloat(name.replace('B', '')),
+      hidden_dim: arch.hidden_dim,
+      num_layers: arch.num_layers,
+      // Prebuilt [hidden_dim, num_layers] tuple returned by getArchitectureDetails
+      details: Object.freeze([arch.hidden_dim, arch.num_layers])
+    }))
+    .sort((a, b) => a.params_billions - b.params_billions);
+  
+  FinetuneCalculator.SORTED_ARCHITECTURES = architectures;
+  FinetuneCalculator.ARCHITECTURE_PARAMS = Float64Array.from(
+    architectures, arch => arch.params_billions
+  );
+};
+
+FinetuneCalculator.buildArchitectures();
+
+// Function to find the index of the smallest architecture that can hold the parameter count
+// (binary search over ARCHITECTURE_PARAMS; the largest architecture if none is big enough)
+FinetuneCalculator.findArchitectureIndex = function(paramsBillions) {
+  const params = FinetuneCalculator.ARCHITECTURE_PARAMS;
+  let low = 0;
+  let high = params.length;
   
-  for (const arch of sortedArchs) {
-    if (parseFloat(arch.replace('B', '')) >= paramsBillions) {
-      return arch;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (params[mid] >= paramsBillions) {
+      high = mid;
+    } else {
+      low = mid + 1;
     }
   }
   
-  // Return the largest if none found
-  return sortedArchs[sortedArchs.length - 1];
+  return Math.min(low, params.length - 1);
+};
+
+// Function to find the smallest architecture that can hold the parameter count
+FinetuneCalculator.findArchitecture = function(paramsBillions) {
+  const index = FinetuneCalculator.findArchitectureIndex(paramsBillions);
+  return FinetuneCalculator.SORTED_ARCHITECTURES[index];
+};
+
+// Function to get closest architecture based on parameter count
+FinetuneCalculator.getClosestArchitecture = function(paramsBillions) {
+  return FinetuneCalculator.findArchitecture(paramsBillions).name;
 };
 
 // Function to get architecture details
 FinetuneCalculator.getArchitectureDetails = function(paramsBillions) {
-  const closestArch = FinetuneCalculator.getClosestArchitecture(paramsBillions);
-  return [
-    FinetuneCalculator.DEFAULT_ARCHITECTURES[closestArch].hidden_dim,
-    FinetuneCalculator.DEFAULT_ARCHITECTURES[closestArch].num_layers
-  ];
+  return FinetuneCalculator.findArchitecture(paramsBillions).details;
 };
 
 // Function to calculate model weights
@@ -126,14 +200,18 @@ FinetuneCalculator.calculateGradientAccumulationReduction = function(batchSize,
   return effectiveBatchSize / batchSize;
 };
 
+// Function to calculate KV cache per token in GB for a known number of bytes per element
+FinetuneCalculator.calculateKVCachePerToken = function(hiddenDim, numLayers, bytesPerElement) {
+  // 2 is for Key and Value tensors, folded into the bytes-to-GB factor
+  return hiddenDim * numLayers * bytesPerElement * 2e-9;
+};
+
 // Function to calculate KV cache
 FinetuneCalculator.calculateKVCache = function(hiddenDim, numLayers, batchSize, seqLength, precision) {
   const bytesPerElement = FinetuneCalculator.PRECISION_BYTES[precision];
   
-  // 2 is for Key and Value tensors
-  const kvCachePerToken = (hiddenDim * 2 * bytesPerElement * numLayers) / 10**9;
-  
-  return batchSize * seqLength * kvCachePerToken;
+  return batchSize * seqLength *
+    FinetuneCalculator.calculateKVCachePerToken(hiddenDim, numLayers, bytesPerElement);
 };
 
 // Function to calculate total training VRAM
@@ -174,93 +252,230 @@ FinetuneCalculator.round = function(num, decimals) {
   return Number(Math.round(num + 'e' + decimals) + 'e-' + decimals);
 };
 
-// Main function to compute fine-tuning requirements
-FinetuneCalculator.computeFinetuningRequirements = function(
+// Cache of raw fine-tuning results keyed by their input arguments
+FinetuneCalculator.CACHE_MAX_ENTRIES = 512;
+FinetuneCalculator.requirementsCache = new Map();
+
+// Function to clear cached results (call after changing FINETUNING_METHODS or
+// DEFAULT_ARCHITECTURES at runtime)
+FinetuneCalculator.clearCache = function() {
+  FinetuneCalculator.buildMethodConfigs();
+  FinetuneCalculator.buildArchitectures();
+  FinetuneCalculator.requirementsCache.clear();
+};
+
+// Function to compute the VRAM components for an already resolved method and architecture
+// (same formulas as the calculate* helpers above; the only place total training VRAM is summed)
+FinetuneCalculator.computeVramComponents = function(
+  paramsBillions,
+  methodConfig,
+  hiddenDim,
+  numLayers,
+  batchSize,
+  seqLength,
+  gradAccumSteps
+) {
+  const bytesPerParam = methodConfig.weight_bytes;
+  const modelWeights = paramsBillions * bytesPerParam;
+  // Activations scale with the micro-batch, so divide by the accumulation steps
+  const activationMemory = (modelWeights * methodConfig.activation_factor) /
+    (gradAccumSteps > 1 ? gradAccumSteps : 1);
+  const optimizerStates = modelWeights * methodConfig.optimizer_states_factor;
+  const kvCache = (batchSize / gradAccumSteps) * seqLength *
+    FinetuneCalculator.calculateKVCachePerToken(hiddenDim, numLayers, bytesPerParam);
+  
+  // Calculate total VRAM, including adapter modules and a 20% training overhead
+  const totalVram = (
+    modelWeights +
+    activationMemory +
+    optimizerStates +
+    kvCache +
+    modelWeights * methodConfig.adapter_overhead
+  ) * 1.2;
+  
+  return { modelWeights, activationMemory, optimizerStates, kvCache, totalVram };
+};
+
+// Function to compute the raw (unrounded) fine-tuning numbers, memoized per argument set
+FinetuneCalculator.computeRawRequirements = function(
   paramsBillions,
   finetuningMethod,
   gpuVram,
   numGpus,
   batchSize,
   seqLength,
-  gradAccumSteps = 1
+  gradAccumSteps
 ) {
+  const cache = FinetuneCalculator.requirementsCache;
+  const cacheKey = [
+    paramsBillions, finetuningMethod, gpuVram, numGpus, batchSize, seqLength, gradAccumSteps
+  ].join('|');
+  const cached = cache.get(cacheKey);
+  if (cached !== undefined) {
+    return cached;
+  }
+  
   // Get method configuration
-  if (!FinetuneCalculator.FINETUNING_METHODS[finetuningMethod]) {
+  const methodConfig = FinetuneCalculator.METHOD_CONFIGS[finetuningMethod];
+  if (!methodConfig) {
     throw new Error(`Unknown fine-tuning method: ${finetuningMethod}`);
   }
   
-  const methodConfig = FinetuneCalculator.FINETUNING_METHODS[finetuningMethod];
-  
   // Get architecture details
   const [hiddenDim, numLayers] = FinetuneCalculator.getArchitectureDetails(paramsBillions);
   
   // Calculate effective batch size with gradient accumulation
   const effectiveBatchSize = batchSize / gradAccumSteps;
   
-  // Calculate components
-  const modelPrecision = methodConfig.model_weight_precision;
-  const modelWeights = FinetuneCalculator.calculateModelWeights(paramsBillions, modelPrecision);
-  const activationMemory = FinetuneCalculator.calculateActivationMemory(
-    modelWeights, 
-    methodConfig.activation_factor,
+  // Calculate all components in one pass
+  const components = FinetuneCalculator.computeVramComponents(
+    paramsBillions,
+    methodConfig,
+    hiddenDim,
+    numLayers,
     batchSize,
+    seqLength,
     gradAccumSteps
   );
-  const optimizerStates = FinetuneCalculator.calculateOptimizerStates(
-    modelWeights, 
-    methodConfig.optimizer_states_factor
-  );
-  const kvCache = FinetuneCalculator.calculateKVCache(
-    hiddenDim, 
-    numLayers, 
-    effectiveBatchSize, 
-    seqLength, 
-    modelPrecision
-  );
-  
-  // Calculate total VRAM
-  const adapterOverhead = methodConfig.adapter_overhead || 0.0;
-  
-  const totalVram = FinetuneCalculator.calculateTotalTrainingVram(
-    modelWeights,
-    activationMemory,
-    optimizerStates,
-    kvCache,
-    adapterOverhead
-  );
+  const totalVram = components.totalVram;
   
   // Distribute across GPUs if multiple GPUs available
   const vramPerGpu = numGpus > 0 ? totalVram / numGpus : totalVram;
   
-  // Check if model will fit
-  const willFit = FinetuneCalculator.willModelFit(totalVram, gpuVram, numGpus);
+  // Check if model will fit, allowing for some overhead (system, CUDA, etc.)
+  const totalAvailableVram = gpuVram * numGpus;
+  const willFit = totalVram <= totalAvailableVram * 0.95;
   
   // Calculate VRAM usage percentage
-  const totalAvailableVram = gpuVram * numGpus;
   const vramUsagePercent = totalAvailableVram > 0
     ? (totalVram / totalAvailableVram) * 100
     : Infinity;
   
-  // Construct detailed result
+  const raw = Object.freeze({
+    willFit,
+    ...components,
+    methodDescription: methodConfig.description,
+    vramPerGpu,
+    vramUsagePercent,
+    effectiveBatchSize,
+    hiddenDim,
+    numLayers
+  });
+  
+  // Evict the oldest entry once the cache is full
+  if (cache.size >= FinetuneCalculator.CACHE_MAX_ENTRIES) {
+    cache.delete(cache.keys().next().value);
+  }
+  cache.set(cacheKey, raw);
+  
+  return raw;
+};
+
+// Function to turn a raw result into the rounded result object shown in the UI
+FinetuneCalculator.formatRequirements = function(raw) {
   return {
-    will_it_fit: willFit,
-    needed_vram: FinetuneCalculator.round(totalVram, 2),
+    will_it_fit: raw.willFit,
+    needed_vram: FinetuneCalculator.round(raw.totalVram, 2),
     details: {
-      model_weights: FinetuneCalculator.round(modelWeights, 2),
-      activation_memory: FinetuneCalculator.round(activationMemory, 2),
-      optimizer_states: FinetuneCalculator.round(optimizerStates, 2),
-      kv_cache: FinetuneCalculator.round(kvCache, 2),
-      method_description: methodConfig.description,
-      total_vram: FinetuneCalculator.round(totalVram, 2),
-      vram_per_gpu: FinetuneCalculator.round(vramPerGpu, 2),
-      vram_usage_percent: FinetuneCalculator.round(vramUsagePercent, 2),
-      effective_batch_size: effectiveBatchSize,
-      architecture: { hidden_dim: hiddenDim, num_layers: numLayers }
+      model_weights: FinetuneCalculator.round(raw.modelWeights, 2),
+      activation_memory: FinetuneCalculator.round(raw.activationMemory, 2),
+      optimizer_states: FinetuneCalculator.round(raw.optimizerStates, 2),
+      kv_cache: FinetuneCalculator.round(raw.kvCache, 2),
+      method_description: raw.methodDescription,
+      total_vram: FinetuneCalculator.round(raw.totalVram, 2),
+      vram_per_gpu: FinetuneCalculator.round(raw.vramPerGpu, 2),
+      vram_usage_percent: FinetuneCalculator.round(raw.vramUsagePercent, 2),
+      effective_batch_size: raw.effectiveBatchSize,
+      architecture: { hidden_dim: raw.hiddenDim, num_layers: raw.numLayers }
     }
   };
 };
 
+// Main function to compute fine-tuning requirements
+FinetuneCalculator.computeFinetuningRequirements = function(
+  paramsBillions,
+  finetuningMethod,
+  gpuVram,
+  numGpus,
+  batchSize,
+  seqLength,
+  gradAccumSteps = 1
+) {
+  return FinetuneCalculator.formatRequirements(
+    FinetuneCalculator.computeRawRequirements(
+      paramsBillions,
+      finetuningMethod,
+      gpuVram,
+      numGpus,
+      batchSize,
+      seqLength,
+      gradAccumSteps
+    )
+  );
+};
+
+// Function to estimate total training VRAM for an already resolved method and architecture
+// (the total from computeVramComponents, so suggestions match the main result exactly)
+FinetuneCalculator.estimateTotalVram = function(
+  paramsBillions,
+  methodConfig,
+  hiddenDim,
+  numLayers,
+  batchSize,
+  seqLength,
+  gradAccumSteps
+) {
+  return FinetuneCalculator.computeVramComponents(
+    paramsBillions,
+    methodConfig,
+    hiddenDim,
+    numLayers,
+    batchSize,
+    seqLength,
+    gradAccumSteps
+  ).totalVram;
+};
+
+// Function to evaluate candidate configurations in a single pass
+// Returns the fitting candidates (only the first one if firstOnly is set) with their total VRAM
+FinetuneCalculator.findFittingCandidates = function(
+  paramsBillions, gpuVram, candidates, firstOnly = true
+) {
+  // Architecture only depends on the parameter count, so resolve it once for all candidates
+  const [hiddenDim, numLayers] = FinetuneCalculator.getArchitectureDetails(paramsBillions);
+  const fitting = [];
+  
+  for (const candidate of candidates) {
+    const totalVram = FinetuneCalculator.estimateTotalVram(
+      paramsBillions,
+      FinetuneCalculator.METHOD_CONFIGS[candidate.method],
+      hiddenDim,
+      numLayers,
+      candidate.batchSize,
+      candidate.seqLength,
+      candidate.gradAccumSteps
+    );
+    
+    if (totalVram <= gpuVram * candidate.numGpus * 0.95) {
+      fitting.push({ ...candidate, totalVram });
+      if (firstOnly) {
+        break;
+      }
+    }
+  }
+  
+  return fitting;
+};
+
+// Maximum number of suggestions returned for a configuration that does not fit
+FinetuneCalculator.MAX_SUGGESTIONS = 3;
+
+// Fine-tuning methods tried as lighter alternatives, built once at load time
+FinetuneCalculator.SUGGESTED_METHODS = Object.freeze(["lora", "qlora"]);
+
 // Function to suggest fine-tuning configurations
+// Options are tried in order of preference (method, grad accumulation, batch size,
+// sequence length, GPU count) and the search stops once maxSuggestions are found
 FinetuneCalculator.suggestFinetuningConfigurations = function(
   paramsBillions,
   finetuningMethod,
@@ -268,12 +483,14 @@ FinetuneCalculator.suggestFinetuningConfigurations = function(
   numGpus,
   batchSize,
   seqLength,
-  gradAccumSteps = 1
+  gradAccumSteps = 1,
+  precomputedResult = null,
+  maxSuggestions = FinetuneCalculator.MAX_SUGGESTIONS
 ) {
   const suggestions = [];
   
-  // Check if current configuration fits
-  const result = FinetuneCalculator.computeFinetuningRequirements(
+  // Check if current configuration fits (reusing the caller's raw result when given)
+  const result = precomputedResult || FinetuneCalculator.computeRawRequirements(
     paramsBillions,
     finetuningMethod,
     gpuVram,
@@ -283,131 +500,124 @@ FinetuneCalculator.suggestFinetuningConfigurations = function(
     gradAccumSteps
   );
   
-  if (result.will_it_fit) {
+  if (result.willFit) {
     // Already fits, no suggestions needed
     return suggestions;
   }
   
+  const current = { method: finetuningMethod, numGpus, batchSize, seqLength, gradAccumSteps };
+  
   // Try different fine-tuning methods
-  for (const method of ["lora", "qlora"]) {
-    if (method !== finetuningMethod) {
-      const suggestionResult = FinetuneCalculator.computeFinetuningRequirements(
-        paramsBillions,
-        method,
-        gpuVram,
-        numGpus,
-        batchSize,
-        seqLength,
-        gradAccumSteps
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: "change_method",
-          method: method,
-          needed_vram: suggestionResult.needed_vram
-        });
-      }
-    }
+  const methodCandidates = FinetuneCalculator.SUGGESTED_METHODS
+    .filter(method => method !== finetuningMethod)
+    .map(method => ({ ...current, method }));
+  
+  const methodFits = FinetuneCalculator.findFittingCandidates(
+    paramsBillions, gpuVram, methodCandidates, false
+  );
+  for (const fit of methodFits) {
+    suggestions.push({
+      type: "change_method",
+      method: fit.method,
+      needed_vram: FinetuneCalculator.round(fit.totalVram, 2)
+    });
   }
   
+  // Total VRAM is affine in (batch size / grad accumulation) * sequence length, so the limits
+  // for the remaining options can be solved for directly. Each chosen candidate is still
+  // confirmed with a single evaluation, which also gives its needed VRAM.
+  const methodConfig = FinetuneCalculator.METHOD_CONFIGS[finetuningMethod];
+  const kvPerToken = result.hiddenDim * result.numLayers * methodConfig.kv_vram_factor;
+  const fixedVram = paramsBillions * methodConfig.fixed_vram_factor;
+  const fullActivationMemory = paramsBillions * methodConfig.activation_vram_factor;
+  const budget = gpuVram * numGpus * 0.95;
+  const tokenBudget =
+    budget - fixedVram - fullActivationMemory / (gradAccumSteps > 1 ? gradAccumSteps : 1);
+  
   // Try gradient accumulation
-  for (const newGradAccum of [2, 4, 8]) {
-    if (newGradAccum > gradAccumSteps) {
-      const suggestionResult = FinetuneCalculator.computeFinetuningRequirements(
-        paramsBillions,
-        finetuningMethod,
-        gpuVram,
-        numGpus,
-        batchSize,
-        seqLength,
-        newGradAccum
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: "increase_grad_accum",
-          grad_accum_steps: newGradAccum,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+  const minGradAccum = budget > fixedVram
+    ? (fullActivationMemory + batchSize * seqLength * kvPerToken) / (budget - fixedVram)
+    : Infinity;
+  if (suggestions.length < maxSuggestions && minGradAccum <= 8) {
+    const gradAccumCandidates = [2, 4, 8]
+      .filter(newGradAccum => newGradAccum > gradAccumSteps && newGradAccum >= minGradAccum)
+      .map(newGradAccum => ({ ...current, gradAccumSteps: newGradAccum }));
+    
+    const fits = FinetuneCalculator.findFittingCandidates(
+      paramsBillions, gpuVram, gradAccumCandidates
+    );
+    for (const fit of fits) {
+      suggestions.push({
+        type: "increase_grad_accum",
+        grad_accum_steps: fit.gradAccumSteps,
+        needed_vram: FinetuneCalculator.round(fit.totalVram, 2)
+      });
     }
   }
   
   // Try reducing batch size
-  if (batchSize > 1) {
-    for (const newBatchSize of [Math.floor(batchSize / 2), 1]) {
-      const suggestionResult = FinetuneCalculator.computeFinetuningRequirements(
-        paramsBillions,
-        finetuningMethod,
-        gpuVram,
-        numGpus,
-        newBatchSize,
-        seqLength,
-        gradAccumSteps
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: "reduce_batch_size",
-          batch_size: newBatchSize,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+  if (suggestions.length < maxSuggestions && batchSize > 1) {
+    const maxBatchSize = (tokenBudget * gradAccumSteps) / (seqLength * kvPerToken);
+    const batchCandidates = [Math.floor(batchSize / 2), 1]
+      .filter(newBatchSize => newBatchSize <= maxBatchSize)
+      .map(newBatchSize => ({ ...current, batchSize: newBatchSize }));
+    
+    const fits = FinetuneCalculator.findFittingCandidates(paramsBillions, gpuVram, batchCandidates);
+    for (const fit of fits) {
+      suggestions.push({
+        type: "reduce_batch_size",
+        batch_size: fit.batchSize,
+        needed_vram: FinetuneCalculator.round(fit.totalVram, 2)
+      });
     }
   }
   
   // Try reducing sequence length
-  if (seqLength > 512) {
-    for (const newSeqLength of [Math.floor(seqLength / 2), 1024, 512]) {
-      const suggestionResult = FinetuneCalculator.computeFinetuningRequirements(
-        paramsBillions,
-        finetuningMethod,
-        gpuVram,
-        numGpus,
-        batchSize,
-        newSeqLength,
-        gradAccumSteps
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: "reduce_sequence_length",
-          sequence_length: newSeqLength,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+  if (suggestions.length < maxSuggestions && seqLength > 512) {
+    const maxSeqLength = tokenBudget / (result.effectiveBatchSize * kvPerToken);
+    const seqCandidates = [Math.floor(seqLength / 2), 1024, 512]
+      .filter(newSeqLength => newSeqLength <= maxSeqLength)
+      .map(newSeqLength => ({ ...current, seqLength: newSeqLength }));
+    
+    const fits = FinetuneCalculator.findFittingCandidates(paramsBillions, gpuVram, seqCandidates);
+    for (const fit of fits) {
+      suggestions.push({
+        type: "reduce_sequence_length",
+        sequence_length: fit.seqLength,
+        needed_vram: FinetuneCalculator.round(fit.totalVram, 2)
+      });
     }
   }
   
-  // Try increasing GPU count
-  if (numGpus < 8) {
-    for (const newNumGpus of [numGpus + 1, numGpus * 2]) {
-      const suggestionResult = FinetuneCalculator.computeFinetuningRequirements(
-        paramsBillions,
-        finetuningMethod,
-        gpuVram,
-        newNumGpus,
-        batchSize,
-        seqLength,
-        gradAccumSteps
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: "increase_gpus",
-          num_gpus: newNumGpus,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+  // Try increasing GPU count, skipping it entirely when more than 8 GPUs would be needed
+  const minNumGpus = result.totalVram / (gpuVram * 0.95);
+  if (suggestions.length < maxSuggestions && numGpus < 8 && minNumGpus <= 8) {
+    const gpuCandidates = [numGpus + 1, numGpus * 2]
+      .filter(newNumGpus => newNumGpus >= minNumGpus && newNumGpus <= 8)
+      .map(newNumGpus => ({ ...current, numGpus: newNumGpus }));
+    
+    const fits = FinetuneCalculator.findFittingCandidates(paramsBillions, gpuVram, gpuCandidates);
+    for (const fit of fits) {
+      suggestions.push({
+        type: "increase_gpus",
+        num_gpus: fit.numGpus,
+        needed_vram: FinetuneCalculator.round(fit.totalVram, 2)
+      });
     }
   }
   
-  return suggestions;
+  return suggestions.slice(0, maxSuggestions);
+};
+
+// Function to resolve a GPU name or direct VRAM value to GB
+FinetuneCalculator.resolveGpuVram = function(gpuName) {
+  const knownVram = FinetuneCalculator.GPU_VRAM_BY_NAME.get(gpuName);
+  if (knownVram !== undefined) {
+    return knownVram;
+  }
+  
+  const gpuVramGB = parseFloat(gpuName);
+  return isNaN(gpuVramGB) ? 24.0 : gpuVramGB; // Default to RTX 4090 if invalid
 };
 
 // Main function to be called from UI
@@ -421,23 +631,10 @@ FinetuneCalculator.calculateFinetuningRequirements = function(
   gradAccumSteps = 1
 ) {
   // Handle GPU VRAM input (either direct value or GPU name)
-  let gpuVramGB;
-  
-  if (typeof gpuName === 'string' && FinetuneCalculator.COMMON_GPUS[gpuName] !== undefined) {
-    gpuVramGB = FinetuneCalculator.COMMON_GPUS[gpuName];
-  } else {
-    try {
-      gpuVramGB = parseFloat(gpuName);
-      if (isNaN(gpuVramGB)) {
-        gpuVramGB = 24.0; // Default to RTX 4090 if invalid
-      }
-    } catch (error) {
-      gpuVramGB = 24.0; // Default to RTX 4090 if invalid
-    }
-  }
+  const gpuVramGB = FinetuneCalculator.resolveGpuVram(gpuName);
   
-  // Compute VRAM requirements
-  const result = FinetuneCalculator.computeFinetuningRequirements(
+  // Compute VRAM requirements (raw numbers are only rounded for the final result)
+  const raw = FinetuneCalculator.computeRawRequirements(
     paramsBillions,
     finetuningMethod,
     gpuVramGB,
@@ -449,7 +646,7 @@ FinetuneCalculator.calculateFinetuningRequirements = function(
   
   // Get suggestions if needed
   let suggestions = [];
-  if (!result.will_it_fit) {
+  if (!raw.willFit) {
     suggestions = FinetuneCalculator.suggestFinetuningConfigurations(
       paramsBillions,
       finetuningMethod,
@@ -457,12 +654,13 @@ FinetuneCalculator.calculateFinetuningRequirements = function(
       numGpus,
       batchSize,
       seqLength,
-      gradAccumSteps
+      gradAccumSteps,
+      raw
     );
   }
   
   // Combine results and suggestions
-  return { ...result, suggestions };
+  return { ...FinetuneCalculator.formatRequirements(raw), suggestions };
 };
 
 // Export the calculator function
@@ -1,32 +1,96 @@
 // inference-calculator.js - JavaScript port of inference.py for VRAM calculations
 
-// Default architectures mapping - parameters to hidden dimensions and layers
+// Default architectures mapping - parameters to hidden dimensions, layers, KV heads and head
+// dimension. Defaults assume multi-head attention (one KV head per query head); models with
+// grouped-query or multi-query attention have fewer KV heads, entered in the side panel
+// Both calculators treat their DEFAULT_ARCHITECTURES as the editable source of truth: the
+// sorted lookup table is derived from it at load time and rebuilt when the cache is cleared
+// (clearVramCache here, FinetuneCalculator.clearCache for fine-tuning)
 const DEFAULT_ARCHITECTURES = {
-  "1B": { hidden_dim: 2048, num_layers: 22 },
-  "3B": { hidden_dim: 3072, num_layers: 26 },
-  "7B": { hidden_dim: 4096, num_layers: 32 },
-  "13B": { hidden_dim: 5120, num_layers: 40 },
-  "30B": { hidden_dim: 7168, num_layers: 60 },
-  "65B": { hidden_dim: 8192, num_layers: 80 },
-  "120B": { hidden_dim: 12288, num_layers: 96 },
-  "405B": { hidden_dim: 16384, num_layers: 120 },
-  "671B": { hidden_dim: 20480, num_layers: 160 }
+  "1B": { hidden_dim: 2048, num_layers: 22, num_kv_heads: 16, head_dim: 128 },
+  "3B": { hidden_dim: 3072, num_layers: 26, num_kv_heads: 24, head_dim: 128 },
+  "7B": { hidden_dim: 4096, num_layers: 32, num_kv_heads: 32, head_dim: 128 },
+  "13B": { hidden_dim: 5120, num_layers: 40, num_kv_heads: 40, head_dim: 128 },
+  "30B": { hidden_dim: 7168, num_layers: 60, num_kv_heads: 56, head_dim: 128 },
+  "65B": { hidden_dim: 8192, num_layers: 80, num_kv_heads: 64, head_dim: 128 },
+  "120B": { hidden_dim: 12288, num_layers: 96, num_kv_heads: 96, head_dim: 128 },
+  "405B": { hidden_dim: 16384, num_layers: 120, num_kv_heads: 128, head_dim: 128 },
+  "671B": { hidden_dim: 20480, num_layers: 160, num_kv_heads: 160, head_dim: 128 }
 };
 
+// Architectures sorted by parameter count (in billions) and their parameter counts as a typed
+// array (same order), so the lookup reads plain numbers instead of table objects
+// Each entry also carries prebuilt detail tuples so lookups return them without allocating
+let ARCHITECTURE_TABLE = [];
+let ARCHITECTURE_PARAMS = new Float64Array(0);
+
+// Function to (re)build ARCHITECTURE_TABLE and ARCHITECTURE_PARAMS from DEFAULT_ARCHITECTURES
+function buildArchitectures() {
+  ARCHITECTURE_TABLE = Object.entries(DEFAULT_ARCHITECTURES)
+    .map(([name, arch]) => Object.freeze({
+      params_billions: parseFloat(name.replace('B', '')),
+      hidden_dim: arch.hidden_dim,
+      num_layers: arch.num_layers,
+      num_kv_heads: arch.num_kv_heads,
+      head_dim: arch.head_dim,
+      details: Object.freeze([arch.hidden_dim, arch.num_layers]),
+      attention: Object.freeze([arch.num_layers, arch.num_kv_heads, arch.head_dim])
+    }))
+    .sort((a, b) => a.params_billions - b.params_billions);
+  ARCHITECTURE_PARAMS = Float64Array.from(ARCHITECTURE_TABLE, arch => arch.params_billions);
+}
+
+buildArchitectures();
+
 // Bytes per parameter for different quantization levels
+// (sub-byte types are packed; per-row padding to whole bytes is not counted)
 const PRECISION_BYTES = {
   "FP32": 4.0,
   "FP16": 2.0,
   "BF16": 2.0,
+  "FP8": 1.0,
   "INT8": 1.0,
   "Q8": 1.0,
+  "MXFP4": 0.5,
   "INT4": 0.5,
   "Q4": 0.5,
   "Q5": 0.625,
   "Q6": 0.75,
+  "INT3": 0.375,
+  "INT2": 0.25,
   "Q2": 0.25
 };
 
+// Conversion factor from bytes to GB (multiplying is cheaper than dividing by 10**9)
+const BYTES_TO_GB = 1e-9;
+
+// Overhead factors applied on top of the base VRAM (reasoning models need more headroom)
+const OVERHEAD_FACTOR = 1.15;
+const REASONING_OVERHEAD_FACTOR = 1.25;
+
+// For inference, activation memory is typically 0.2x model weights
+const ACTIVATION_MEMORY_FRACTION = 0.2;
+
+// Overhead factors per VRAM component, so the KV cache (which grows with every token) can be
+// scaled independently of the weights and activations; defaults apply the same factor to all
+// and callers override individual components through the overheadFactors argument
+const OVERHEAD_FACTORS = Object.freeze({
+  weights: OVERHEAD_FACTOR,
+  activations: OVERHEAD_FACTOR,
+  kv_cache: OVERHEAD_FACTOR
+});
+const REASONING_OVERHEAD_FACTORS = Object.freeze({
+  weights: REASONING_OVERHEAD_FACTOR,
+  activations: REASONING_OVERHEAD_FACTOR,
+  kv_cache: REASONING_OVERHEAD_FACTOR
+});
+
+// Smallest available VRAM used as a divisor, so an empty GPU setup gives a huge usage percentage
+const MIN_AVAILABLE_VRAM = 1e-30;
+
+// Fraction of GPU VRAM usable by the model (the rest is system, CUDA, etc.)
+const USABLE_VRAM_FRACTION = 0.95;
+
 // Common GPU VRAM sizes in GB
 const COMMON_GPUS = {
   "RTX 3060": 12,
@@ -54,28 +118,57 @@ const COMMON_GPUS = {
   "jetson-orin-nano": 8
 };
 
-// Function to get closest architecture based on parameter count
-function getClosestArchitecture(paramsBillions) {
-  const sortedArchs = Object.keys(DEFAULT_ARCHITECTURES)
-    .sort((a, b) => parseFloat(a.replace('B', '')) - parseFloat(b.replace('B', '')));
+// Function to find the index of the smallest architecture that can hold the parameter count
+// (binary search over ARCHITECTURE_PARAMS; the largest architecture if none is big enough)
+function findArchitectureIndex(paramsBillions) {
+  let low = 0;
+  let high = ARCHITECTURE_PARAMS.length;
   
-  for (const arch of sortedArchs) {
-    if (parseFloat(arch.replace('B', '')) >= paramsBillions) {
-      return arch;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (ARCHITECTURE_PARAMS[mid] >= paramsBillions) {
+      high = mid;
+    } else {
+      low = mid + 1;
     }
   }
   
-  // Return the largest if none found
-  return sortedArchs[sortedArchs.length - 1];
+  return Math.min(low, ARCHITECTURE_PARAMS.length - 1);
+}
+
+// Function to find the smallest architecture that can hold the parameter count
+function findArchitecture(paramsBillions) {
+  return ARCHITECTURE_TABLE[findArchitectureIndex(paramsBillions)];
+}
+
+// Function to get closest architecture label based on parameter count
+function getClosestArchitecture(paramsBillions) {
+  return `${findArchitecture(paramsBillions).params_billions}B`;
 }
 
 // Function to get architecture details
 function getArchitectureDetails(paramsBillions) {
-  const closestArch = getClosestArchitecture(paramsBillions);
-  return [
-    DEFAULT_ARCHITECTURES[closestArch].hidden_dim,
-    DEFAULT_ARCHITECTURES[closestArch].num_layers
-  ];
+  return findArchitecture(paramsBillions).details;
+}
+
+// Function to check an optional attention override (null, or a positive whole number)
+function validateAttentionOverride(name, value) {
+  if (value != null && !(Number.isInteger(value) && value > 0)) {
+    throw new Error(`Invalid ${name}: ${value} (expected a positive whole number)`);
+  }
+}
+
+// Function to get the attention details used for the KV cache
+// numKvHeads and headDim override the table defaults (e.g. 8 KV heads for a GQA model)
+function getAttentionDetails(paramsBillions, numKvHeads = null, headDim = null) {
+  validateAttentionOverride('number of KV heads', numKvHeads);
+  validateAttentionOverride('head dimension', headDim);
+  
+  const arch = findArchitecture(paramsBillions);
+  if (numKvHeads == null && headDim == null) {
+    return arch.attention;
+  }
+  return [arch.num_layers, numKvHeads ?? arch.num_kv_heads, headDim ?? arch.head_dim];
 }
 
 // Function to calculate model weights
@@ -86,13 +179,22 @@ function calculateModelWeights(numParams, precision) {
 
 // Function to calculate activation memory
 function calculateActivationMemory(modelWeights) {
-  // For inference, activation memory is typically 0.2x model weights
-  return modelWeights * 0.2;
+  return modelWeights * ACTIVATION_MEMORY_FRACTION;
+}
+
+// Function to calculate the KV cache per token in GB
+function calculateKVCachePerToken(numKvHeads, headDim, numLayers, bytesPerElement) {
+  // 2 is for Key and Value tensors, each numKvHeads * headDim wide per layer
+  return numKvHeads * headDim * 2 * bytesPerElement * numLayers * BYTES_TO_GB;
 }
 
 // Function to calculate KV cache
+// precision is the KV cache precision, which may be lower than the weights precision
+// (quantized FP8/INT8/INT4 caches also keep FP32 scale factors per layer and head, about
+// numLayers * numKvHeads * 4 bytes, which is negligible next to the cache and not counted)
 function calculateKVCache(
-  hiddenDim,
+  numKvHeads,
+  headDim,
   numLayers,
   batchSize,
   seqLength,
@@ -100,26 +202,40 @@ function calculateKVCache(
   concurrentRequests = 1
 ) {
   const bytesPerElement = PRECISION_BYTES[precision];
-  
-  // 2 is for Key and Value tensors
-  const kvCachePerToken = (hiddenDim * 2 * bytesPerElement * numLayers) / 10**9;
+  const kvCachePerToken = calculateKVCachePerToken(numKvHeads, headDim, numLayers, bytesPerElement);
   
   return batchSize * seqLength * kvCachePerToken * concurrentRequests;
 }
 
+// Function to get the per-component overhead factors
+// overheadFactors may override some of the defaults, e.g. { kv_cache: 1.0 } to leave the
+// KV cache unscaled while weights and activations keep the model's overhead
+function getOverheadFactors(isReasoning = false, overheadFactors = null) {
+  const defaults = isReasoning ? REASONING_OVERHEAD_FACTORS : OVERHEAD_FACTORS;
+  return overheadFactors == null ? defaults : { ...defaults, ...overheadFactors };
+}
+
+// Function to apply the per-component overhead factors to the VRAM components
+// Written as the weights factor on the whole base plus the extra for activations and KV cache,
+// so equal factors give exactly the base VRAM times that factor
+function applyOverheadFactors(modelWeights, activationMemory, kvCache, overheads) {
+  return (modelWeights + activationMemory + kvCache) * overheads.weights +
+    activationMemory * (overheads.activations - overheads.weights) +
+    kvCache * (overheads.kv_cache - overheads.weights);
+}
+
 // Function to calculate total VRAM
 function calculateTotalVRAM(
   modelWeights,
   activationMemory,
   kvCache,
-  isReasoning = false
+  isReasoning = false,
+  overheadFactors = null
 ) {
-  const baseVram = modelWeights + activationMemory + kvCache;
-  
-  // Apply overhead factor
-  const overheadFactor = isReasoning ? 1.25 : 1.15;
+  // Apply the overhead factor of each component
+  const overheads = getOverheadFactors(isReasoning, overheadFactors);
   
-  return baseVram * overheadFactor;
+  return applyOverheadFactors(modelWeights, activationMemory, kvCache, overheads);
 }
 
 // Function to check if model will fit
@@ -127,13 +243,26 @@ function willModelFit(totalVram, gpuVram, numGpus = 1) {
   const availableVram = gpuVram * numGpus;
   
   // Allow for some overhead (system, CUDA, etc.)
-  const effectiveVram = availableVram * 0.95;
+  const effectiveVram = availableVram * USABLE_VRAM_FRACTION;
   
   return totalVram <= effectiveVram;
 }
 
-// Main function to compute VRAM requirements
-function computeVramRequirements(
+// Cache of raw VRAM results keyed by their input arguments
+const VRAM_CACHE_MAX_ENTRIES = 4096;
+const vramRequirementsCache = new Map();
+
+// Function to clear cached VRAM results (call after changing PRECISION_BYTES or
+// DEFAULT_ARCHITECTURES at runtime)
+function clearVramCache() {
+  buildArchitectures();
+  vramRequirementsCache.clear();
+}
+
+// Function to compute the raw (unrounded) VRAM numbers, memoized per argument set
+// kvPrecision null means the KV cache uses the weights precision (no KV cache quantization);
+// numKvHeads/headDim default to the architecture table
+function computeRawVramRequirements(
   paramsBillions,
   precision,
   gpuVram,
@@ -141,68 +270,246 @@ function computeVramRequirements(
   batchSize,
   seqLength,
   concurrentRequests,
-  isReasoning
+  isReasoning,
+  kvPrecision = null,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
 ) {
+  const overheadKey = overheadFactors == null
+    ? ''
+    : `${overheadFactors.weights}/${overheadFactors.activations}/${overheadFactors.kv_cache}`;
+  const cacheKey = [
+    paramsBillions, precision, gpuVram, numGpus, batchSize, seqLength,
+    concurrentRequests, isReasoning, kvPrecision, numKvHeads, headDim, overheadKey
+  ].join('|');
+  const cached = vramRequirementsCache.get(cacheKey);
+  if (cached !== undefined) {
+    return cached;
+  }
+  
   // Get architecture details
   const [hiddenDim, numLayers] = getArchitectureDetails(paramsBillions);
+  const [, kvHeads, kvHeadDim] = getAttentionDetails(paramsBillions, numKvHeads, headDim);
   
-  // Calculate components
-  const modelWeights = calculateModelWeights(paramsBillions, precision);
-  const activationMemory = calculateActivationMemory(modelWeights);
-  const kvCache = calculateKVCache(
-    hiddenDim,
-    numLayers,
-    batchSize,
-    seqLength,
-    precision,
-    concurrentRequests
-  );
-  
-  // Calculate total VRAM
-  const totalVram = calculateTotalVRAM(
-    modelWeights,
-    activationMemory,
-    kvCache,
-    isReasoning
-  );
-  
-  // Check if model will fit
-  const willFit = willModelFit(totalVram, gpuVram, numGpus);
+  // Calculate all components in one pass
+  const components = createKVCacheEstimator(
+    paramsBillions, precision, isReasoning, gpuVram, numGpus, kvPrecision, numKvHeads, headDim,
+    overheadFactors
+  ).components(batchSize, seqLength, concurrentRequests);
+  const totalVram = components.totalVram;
   
   // Compute effective VRAM per GPU
   const vramPerGpu = numGpus > 0 ? totalVram / numGpus : totalVram;
   
-  // Calculate overhead factor
-  const overheadFactor = isReasoning ? 1.25 : 1.15;
+  // Calculate VRAM usage percentage (clamped divisor instead of a zero check)
+  const vramUsagePercent = (totalVram / Math.max(gpuVram * numGpus, MIN_AVAILABLE_VRAM)) * 100;
   
-  // Calculate base VRAM (before overhead)
-  const baseVram = modelWeights + activationMemory + kvCache;
+  const raw = Object.freeze({
+    ...components,
+    vramPerGpu,
+    vramUsagePercent,
+    hiddenDim,
+    numLayers,
+    numKvHeads: kvHeads,
+    headDim: kvHeadDim
+  });
   
-  // Calculate VRAM usage percentage
-  const totalAvailableVram = gpuVram * numGpus;
-  const vramUsagePercent = totalAvailableVram > 0
-    ? (totalVram / totalAvailableVram) * 100
-    : Infinity;
+  // Evict the oldest entry once the cache is full
+  if (vramRequirementsCache.size >= VRAM_CACHE_MAX_ENTRIES) {
+    vramRequirementsCache.delete(vramRequirementsCache.keys().next().value);
+  }
+  vramRequirementsCache.set(cacheKey, raw);
   
-  // Return detailed result
+  return raw;
+}
+
+// Function to turn a raw result into the rounded result object shown in the UI
+// (a fresh object each call, so callers may modify it)
+function formatVramRequirements(raw) {
   return {
-    will_it_fit: willFit,
-    needed_vram: round(totalVram, 2),
-    total_kv_cache: round(kvCache, 2),
+    will_it_fit: raw.willFit,
+    needed_vram: round(raw.totalVram, 2),
+    total_kv_cache: round(raw.kvCache, 2),
     details: {
-      model_weights: round(modelWeights, 2),
-      activation_memory: round(activationMemory, 2),
-      kv_cache: round(kvCache, 2),
-      base_vram: round(baseVram, 2),
-      overhead_factor: overheadFactor,
-      total_vram: round(totalVram, 2),
-      vram_per_gpu: round(vramPerGpu, 2),
-      vram_usage_percent: round(vramUsagePercent, 2),
-      architecture: { hidden_dim: hiddenDim, num_layers: numLayers }
+      model_weights: round(raw.modelWeights, 2),
+      activation_memory: round(raw.activationMemory, 2),
+      kv_cache: round(raw.kvCache, 2),
+      base_vram: round(raw.baseVram, 2),
+      overhead_factor: round(raw.overheadFactor, 4),
+      total_vram: round(raw.totalVram, 2),
+      vram_per_gpu: round(raw.vramPerGpu, 2),
+      vram_usage_percent: round(raw.vramUsagePercent, 2),
+      architecture: {
+        hidden_dim: raw.hiddenDim,
+        num_layers: raw.numLayers,
+        num_kv_heads: raw.numKvHeads,
+        head_dim: raw.headDim
+      }
+    }
+  };
+}
+
+// Main function to compute VRAM requirements
+function computeVramRequirements(
+  paramsBillions,
+  precision,
+  gpuVram,
+  numGpus,
+  batchSize,
+  seqLength,
+  concurrentRequests,
+  isReasoning,
+  kvPrecision = null,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
+) {
+  return formatVramRequirements(
+    computeRawVramRequirements(
+      paramsBillions,
+      precision,
+      gpuVram,
+      numGpus,
+      batchSize,
+      seqLength,
+      concurrentRequests,
+      isReasoning,
+      kvPrecision,
+      numKvHeads,
+      headDim,
+      overheadFactors
+    )
+  );
+}
+
+// Function to create an estimator bound to a fixed model, precision and GPU setup
+// Everything except batch size, sequence length and concurrency is resolved once, which
+// suits planners that query many (batch, sequence) pairs for the same configuration
+function createKVCacheEstimator(
+  paramsBillions,
+  precision,
+  isReasoning,
+  gpuVram,
+  numGpus,
+  kvPrecision = null,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
+) {
+  const [numLayers, kvHeads, kvHeadDim] = getAttentionDetails(paramsBillions, numKvHeads, headDim);
+  const modelWeights = calculateModelWeights(paramsBillions, precision);
+  const activationMemory = calculateActivationMemory(modelWeights);
+  const kvCachePerToken = calculateKVCachePerToken(
+    kvHeads, kvHeadDim, numLayers, PRECISION_BYTES[kvPrecision ?? precision]
+  );
+  const overheads = getOverheadFactors(isReasoning, overheadFactors);
+  // Allow for some overhead (system, CUDA, etc.)
+  const effectiveVram = gpuVram * numGpus * USABLE_VRAM_FRACTION;
+  
+  // KV cache in GB for the given batch size and sequence length
+  const kvCache = (batchSize, seqLength, concurrentRequests = 1) =>
+    batchSize * seqLength * kvCachePerToken * concurrentRequests;
+  
+  // Total VRAM in GB for the given batch size and sequence length
+  const vram = (batchSize, seqLength, concurrentRequests = 1) => applyOverheadFactors(
+    modelWeights, activationMemory, kvCache(batchSize, seqLength, concurrentRequests), overheads
+  );
+  
+  return {
+    kvCache,
+    vram,
+    // Whether a total VRAM value fits on the bound GPU setup
+    fits(totalVram) {
+      return totalVram <= effectiveVram;
+    },
+    // All VRAM components for the given batch size and sequence length
+    components(batchSize, seqLength, concurrentRequests = 1) {
+      const kvCacheSize = kvCache(batchSize, seqLength, concurrentRequests);
+      const baseVram = modelWeights + activationMemory + kvCacheSize;
+      const totalVram = applyOverheadFactors(
+        modelWeights, activationMemory, kvCacheSize, overheads
+      );
+      
+      return {
+        modelWeights,
+        activationMemory,
+        kvCache: kvCacheSize,
+        baseVram,
+        // Effective overhead over the whole base VRAM
+        overheadFactor: baseVram > 0 ? totalVram / baseVram : overheads.weights,
+        totalVram,
+        willFit: totalVram <= effectiveVram
+      };
     }
   };
 }
 
+// Function to evaluate candidate configurations in a single pass
+// Returns the first candidate that fits together with its total VRAM, or null
+function findFittingCandidate(
+  paramsBillions,
+  gpuVram,
+  concurrentRequests,
+  isReasoning,
+  candidates,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
+) {
+  for (const candidate of candidates) {
+    const estimator = createKVCacheEstimator(
+      paramsBillions,
+      candidate.precision,
+      isReasoning,
+      gpuVram,
+      candidate.numGpus,
+      candidate.kvPrecision,
+      numKvHeads,
+      headDim,
+      overheadFactors
+    );
+    const totalVram = estimator.vram(candidate.batchSize, candidate.seqLength, concurrentRequests);
+    
+    if (estimator.fits(totalVram)) {
+      return { ...candidate, totalVram };
+    }
+  }
+  
+  return null;
+}
+
+// Granularity of suggested sequence lengths
+const SEQUENCE_LENGTH_STEP = 128;
+
+// Precisions tried as more aggressive quantization, built once at load time
+const SUGGESTED_PRECISIONS = Object.freeze(['Q4', 'Q2']);
+
+// Function to find the largest integer in [low, high] for which fits(value) is true
+// fits must be monotonic (true up to some value, false above it); returns null if nothing fits
+function findLargestFitting(low, high, fits) {
+  if (low > high || !fits(low)) {
+    return null;
+  }
+  
+  while (low < high) {
+    const mid = Math.floor((low + high + 1) / 2);
+    if (fits(mid)) {
+      low = mid;
+    } else {
+      high = mid - 1;
+    }
+  }
+  
+  return low;
+}
+
+// Function to build a suggestion entry
+// e.g. { type: 'increase_gpus', num_gpus: 2, needed_vram: 30.5 }
+function makeSuggestion(type, outputField, value, totalVram) {
+  return { type, [outputField]: value, needed_vram: round(totalVram, 2) };
+}
+
 // Function to suggest configurations
 function suggestConfigurations(
   paramsBillions,
@@ -212,12 +519,16 @@ function suggestConfigurations(
   batchSize,
   seqLength,
   concurrentRequests,
-  isReasoning
+  isReasoning,
+  kvPrecision = null,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
 ) {
   const suggestions = [];
   
-  // Check if current configuration fits
-  const result = computeVramRequirements(
+  // Check if current configuration fits (only the raw numbers are needed here)
+  const result = computeRawVramRequirements(
     paramsBillions,
     precision,
     gpuVram,
@@ -225,113 +536,84 @@ function suggestConfigurations(
     batchSize,
     seqLength,
     concurrentRequests,
-    isReasoning
+    isReasoning,
+    kvPrecision,
+    numKvHeads,
+    headDim,
+    overheadFactors
   );
   
-  if (result.will_it_fit) {
+  if (result.willFit) {
     // Already fits, no suggestions needed
     return suggestions;
   }
   
+  const current = { precision, kvPrecision, numGpus, batchSize, seqLength };
+  
+  // Add a suggestion for the first candidate that fits, reporting its value of `field`
+  const addFirstFitting = (type, field, outputField, candidates) => {
+    const fit = findFittingCandidate(
+      paramsBillions, gpuVram, concurrentRequests, isReasoning, candidates, numKvHeads, headDim,
+      overheadFactors
+    );
+    if (fit) {
+      suggestions.push(makeSuggestion(type, outputField, fit[field], fit.totalVram));
+    }
+  };
+  
+  // VRAM grows monotonically with batch size and sequence length, so the largest
+  // value that still fits can be found with a binary search
+  const estimator = createKVCacheEstimator(
+    paramsBillions, precision, isReasoning, gpuVram, numGpus, kvPrecision, numKvHeads, headDim,
+    overheadFactors
+  );
+  const totalVramFor = (newBatchSize, newSeqLength) =>
+    estimator.vram(newBatchSize, newSeqLength, concurrentRequests);
+  
   // Try reducing batch size
   if (batchSize > 1) {
-    for (const newBatchSize of [Math.floor(batchSize / 2), 1]) {
-      const suggestionResult = computeVramRequirements(
-        paramsBillions,
-        precision,
-        gpuVram,
-        numGpus,
-        newBatchSize,
-        seqLength,
-        concurrentRequests,
-        isReasoning
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: 'reduce_batch_size',
-          batch_size: newBatchSize,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+    const newBatchSize = findLargestFitting(
+      1,
+      batchSize - 1,
+      candidate => estimator.fits(totalVramFor(candidate, seqLength))
+    );
+    
+    if (newBatchSize !== null) {
+      suggestions.push(makeSuggestion(
+        'reduce_batch_size', 'batch_size', newBatchSize, totalVramFor(newBatchSize, seqLength)
+      ));
     }
   }
   
-  // Try reducing sequence length
+  // Try reducing sequence length (in steps of SEQUENCE_LENGTH_STEP tokens)
   if (seqLength > 512) {
-    for (const newSeqLength of [Math.floor(seqLength / 2), 1024, 512]) {
-      const suggestionResult = computeVramRequirements(
-        paramsBillions,
-        precision,
-        gpuVram,
-        numGpus,
-        batchSize,
+    const steps = findLargestFitting(
+      1,
+      Math.floor((seqLength - 1) / SEQUENCE_LENGTH_STEP),
+      candidate => estimator.fits(totalVramFor(batchSize, candidate * SEQUENCE_LENGTH_STEP))
+    );
+    
+    if (steps !== null) {
+      const newSeqLength = steps * SEQUENCE_LENGTH_STEP;
+      suggestions.push(makeSuggestion(
+        'reduce_sequence_length',
+        'sequence_length',
         newSeqLength,
-        concurrentRequests,
-        isReasoning
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: 'reduce_sequence_length',
-          sequence_length: newSeqLength,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
+        totalVramFor(batchSize, newSeqLength)
+      ));
     }
   }
   
-  // Try more aggressive quantization
-  const precisionOptions = ['Q4', 'Q2'];
-  for (const newPrecision of precisionOptions) {
-    if (PRECISION_BYTES[newPrecision] < PRECISION_BYTES[precision]) {
-      const suggestionResult = computeVramRequirements(
-        paramsBillions,
-        newPrecision,
-        gpuVram,
-        numGpus,
-        batchSize,
-        seqLength,
-        concurrentRequests,
-        isReasoning
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: 'more_quantization',
-          precision: newPrecision,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
-    }
-  }
+  // Try more aggressive quantization (a KV cache without its own precision, i.e. a null
+  // kvPrecision, follows the weights; an explicitly chosen KV precision is kept)
+  addFirstFitting('more_quantization', 'precision', 'precision', SUGGESTED_PRECISIONS
+    .filter(newPrecision => PRECISION_BYTES[newPrecision] < PRECISION_BYTES[precision])
+    .map(newPrecision => ({ ...current, precision: newPrecision })));
   
   // Try increasing GPU count
   if (numGpus < 8) {
-    for (const newNumGpus of [numGpus + 1, numGpus * 2]) {
-      const suggestionResult = computeVramRequirements(
-        paramsBillions,
-        precision,
-        gpuVram,
-        newNumGpus,
-        batchSize,
-        seqLength,
-        concurrentRequests,
-        isReasoning
-      );
-      
-      if (suggestionResult.will_it_fit) {
-        suggestions.push({
-          type: 'increase_gpus',
-          num_gpus: newNumGpus,
-          needed_vram: suggestionResult.needed_vram
-        });
-        break;
-      }
-    }
+    addFirstFitting('increase_gpus', 'numGpus', 'num_gpus', [numGpus + 1, numGpus * 2]
+      .map(newNumGpus => ({ ...current, numGpus: newNumGpus })));
   }
   
   return suggestions;
@@ -342,7 +624,25 @@ function round(num, decimals) {
   return Number(Math.round(num + 'e' + decimals) + 'e-' + decimals);
 }
 
+// GPU VRAM sizes by name as a Map, built once at load time; unlike indexing COMMON_GPUS
+// this is a single lookup that only matches the listed names (never inherited properties)
+const GPU_VRAM_BY_NAME = new Map(Object.entries(COMMON_GPUS));
+
+// Function to resolve a GPU name or direct VRAM value to GB
+function resolveGpuVram(gpuName) {
+  const knownVram = GPU_VRAM_BY_NAME.get(gpuName);
+  if (knownVram !== undefined) {
+    return knownVram;
+  }
+  
+  const gpuVramGB = parseFloat(gpuName);
+  return isNaN(gpuVramGB) ? 24.0 : gpuVramGB; // Default to RTX 4090 if invalid
+}
+
 // Main function to be called from UI
+// kvPrecision is the KV cache precision (e.g. "FP8" or "INT8"), or null for the weights precision;
+// numKvHeads and headDim describe grouped-query attention (null uses the architecture table);
+// overheadFactors overrides per-component overheads ({ weights, activations, kv_cache })
 function calculateVramRequirements(
   paramsBillions,
   precision,
@@ -351,26 +651,17 @@ function calculateVramRequirements(
   batchSize,
   seqLength,
   concurrentRequests,
-  isReasoning
+  isReasoning,
+  kvPrecision = null,
+  numKvHeads = null,
+  headDim = null,
+  overheadFactors = null
 ) {
   // Handle GPU VRAM input (either direct value or GPU name)
-  let gpuVramGB;
-  
-  if (typeof gpuName === 'string' && COMMON_GPUS[gpuName] !== undefined) {
-    gpuVramGB = COMMON_GPUS[gpuName];
-  } else {
-    try {
-      gpuVramGB = parseFloat(gpuName);
-      if (isNaN(gpuVramGB)) {
-        gpuVramGB = 24.0; // Default to RTX 4090 if invalid
-      }
-    } catch (error) {
-      gpuVramGB = 24.0; // Default to RTX 4090 if invalid
-    }
-  }
+  const gpuVramGB = resolveGpuVram(gpuName);
   
-  // Compute VRAM requirements
-  const result = computeVramRequirements(
+  // Compute VRAM requirements (raw numbers are only rounded for the final result)
+  const raw = computeRawVramRequirements(
     paramsBillions,
     precision,
     gpuVramGB,
@@ -378,12 +669,16 @@ function calculateVramRequirements(
     batchSize,
     seqLength,
     concurrentRequests,
-    isReasoning
+    isReasoning,
+    kvPrecision,
+    numKvHeads,
+    headDim,
+    overheadFactors
   );
   
   // Get suggestions if needed
   let suggestions = [];
-  if (!result.will_it_fit) {
+  if (!raw.willFit) {
     suggestions = suggestConfigurations(
       paramsBillions,
       precision,
@@ -392,12 +687,16 @@ function calculateVramRequirements(
       batchSize,
       seqLength,
       concurrentRequests,
-      isReasoning
+      isReasoning,
+      kvPrecision,
+      numKvHeads,
+      headDim,
+      overheadFactors
     );
   }
   
   // Combine results and suggestions
-  return { ...result, suggestions };
+  return { ...formatVramRequirements(raw), suggestions };
 }
 
 // Export the calculator function
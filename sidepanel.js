@@ -476,6 +476,13 @@ document.addEventListener('DOMContentLoaded', () => {
     return paramsBillions;
   }
   
+  // Function to read an optional whole-number input, returning null when it is empty
+  // (Number instead of parseInt, so "1.5" is rejected by the calculator instead of becoming 1)
+  function readOptionalInt(elementId) {
+    const value = document.getElementById(elementId).value.trim();
+    return value === '' ? null : Number(value);
+  }
+  
   // Function to gather input values and trigger inference calculation
   function performInferenceCalculation() {
     // Get model parameter count from model info
@@ -483,6 +490,11 @@ document.addEventListener('DOMContentLoaded', () => {
     
     // Get input values
     const precision = document.getElementById('precision').value.toUpperCase();
+    // "Same as weights" is passed as null so the KV cache follows the weights precision
+    const kvPrecision = document.getElementById('kv-cache-precision').value || null;
+    // Empty attention fields are passed as null so the architecture table is used
+    const numKvHeads = readOptionalInt('kv-heads');
+    const headDim = readOptionalInt('head-dim');
     const gpuName = document.getElementById('gpu').value;
     const numGpus = parseInt(document.getElementById('number-of-gpus').value, 10);
     const batchSize = parseInt(document.getElementById('batch-size').value, 10);
@@ -493,6 +505,9 @@ document.addEventListener('DOMContentLoaded', () => {
     console.log('Calculating inference VRAM for:', {
       paramsBillions,
       precision,
+      kvPrecision,
+      numKvHeads,
+      headDim,
       gpuName,
       numGpus,
       batchSize,
@@ -511,7 +526,10 @@ document.addEventListener('DOMContentLoaded', () => {
         batchSize,
         seqLength,
         concurrentRequests,
-        isReasoning
+        isReasoning,
+        kvPrecision,
+        numKvHeads,
+        headDim
       );
       
       // Display the results
@@ -599,6 +617,18 @@ document.addEventListener('DOMContentLoaded', () => {
     displayCalculationResults(result, true);
   }
   
+  // Suggestion text by suggestion type (a single lookup instead of a switch per suggestion)
+  const SUGGESTION_FORMATTERS = new Map([
+    ['reduce_batch_size', suggestion => `Reduce batch size to ${suggestion.batch_size}`],
+    ['reduce_sequence_length',
+      suggestion => `Reduce sequence length to ${suggestion.sequence_length}`],
+    ['more_quantization', suggestion => `Use ${suggestion.precision} precision`],
+    ['increase_gpus', suggestion => `Use ${suggestion.num_gpus} GPUs`],
+    ['change_method', suggestion => `Use ${suggestion.method} method`],
+    ['increase_grad_accum',
+      suggestion => `Increase gradient accumulation steps to ${suggestion.grad_accum_steps}`]
+  ]);
+  
   // Common function to display calculation results
   function displayCalculationResults(result, isFinetuning) {
     // Show the results section
@@ -641,10 +671,24 @@ document.addEventListener('DOMContentLoaded', () => {
     const details = result.details;
     const detailsContent = document.getElementById('details-content');
     
-    let detailsHtml = '';
+    // Fine-tuning specific details
+    const finetuningDetailsHtml = isFinetuning ? `
+      <div class="detail-item">
+        <div class="detail-label">Optimizer States:</div>
+        <div class="detail-value">${details.optimizer_states} GB</div>
+      </div>
+      <div class="detail-item">
+        <div class="detail-label">Effective Batch Size:</div>
+        <div class="detail-value">${details.effective_batch_size}</div>
+      </div>
+      <div class="detail-item">
+        <div class="detail-label">Method:</div>
+        <div class="detail-value">${details.method_description}</div>
+      </div>
+    ` : '';
     
-    // Common core components for both modes
-    detailsHtml += `
+    // Build the details in a single template: core components, mode specific details, totals
+    detailsContent.innerHTML = `
       <div class="detail-item">
         <div class="detail-label">Model Weights:</div>
         <div class="detail-value">${details.model_weights} GB</div>
@@ -657,28 +701,7 @@ document.addEventListener('DOMContentLoaded', () => {
         <div class="detail-label">KV Cache:</div>
         <div class="detail-value">${details.kv_cache} GB</div>
       </div>
-    `;
-    
-    // Add fine-tuning specific details
-    if (isFinetuning) {
-      detailsHtml += `
-        <div class="detail-item">
-          <div class="detail-label">Optimizer States:</div>
-          <div class="detail-value">${details.optimizer_states} GB</div>
-        </div>
-        <div class="detail-item">
-          <div class="detail-label">Effective Batch Size:</div>
-          <div class="detail-value">${details.effective_batch_size}</div>
-        </div>
-        <div class="detail-item">
-          <div class="detail-label">Method:</div>
-          <div class="detail-value">${details.method_description}</div>
-        </div>
-      `;
-    }
-    
-    // Add common details
-    detailsHtml += `
+      ${finetuningDetailsHtml}
       <div class="detail-item">
         <div class="detail-label">Total VRAM:</div>
         <div class="detail-value">${details.total_vram} GB</div>
@@ -689,8 +712,6 @@ document.addEventListener('DOMContentLoaded', () => {
       </div>
     `;
     
-    detailsContent.innerHTML = detailsHtml;
-    
     // Display suggestions if available
     const suggestionsSection = document.getElementById('suggestions-section');
     const suggestionsContent = document.getElementById('suggestions-content');
@@ -698,35 +719,15 @@ document.addEventListener('DOMContentLoaded', () => {
     if (result.suggestions && result.suggestions.length > 0) {
       suggestionsSection.classList.remove('hidden');
       
-      let suggestionsHtml = '';
-      result.suggestions.forEach(suggestion => {
-        let suggestionText = '';
-        
-        switch (suggestion.type) {
-          case 'reduce_batch_size':
-            suggestionText = `Reduce batch size to ${suggestion.batch_size} (${suggestion.needed_vram} GB)`;
-            break;
-          case 'reduce_sequence_length':
-            suggestionText = `Reduce sequence length to ${suggestion.sequence_length} (${suggestion.needed_vram} GB)`;
-            break;
-          case 'more_quantization':
-            suggestionText = `Use ${suggestion.precision} precision (${suggestion.needed_vram} GB)`;
-            break;
-          case 'increase_gpus':
-            suggestionText = `Use ${suggestion.num_gpus} GPUs (${suggestion.needed_vram} GB)`;
-            break;
-          case 'change_method':
-            suggestionText = `Use ${suggestion.method} method (${suggestion.needed_vram} GB)`;
-            break;
-          case 'increase_grad_accum':
-            suggestionText = `Increase gradient accumulation steps to ${suggestion.grad_accum_steps} (${suggestion.needed_vram} GB)`;
-            break;
-        }
+      // Build all suggestion items at once and join them into a single string
+      suggestionsContent.innerHTML = result.suggestions.map(suggestion => {
+        const formatSuggestion = SUGGESTION_FORMATTERS.get(suggestion.type);
+        const suggestionText = formatSuggestion
+          ? `${formatSuggestion(suggestion)} (${suggestion.needed_vram} GB)`
+          : '';
         
-        suggestionsHtml += `<div class="suggestion-item">${suggestionText}</div>`;
-      });
-      
-      suggestionsContent.innerHTML = suggestionsHtml;
+        return `<div class="suggestion-item">${suggestionText}</div>`;
+      }).join('');
     } else {
       suggestionsSection.classList.add('hidden');
     }